@@ -1,13 +1,22 @@
 """
 Flask Web Application for Weather Data Analytics Dashboard
 """
-from flask import Flask, render_template, jsonify
-from pyspark.sql import SparkSession
-from data_generator import generate_weather_data
+from flask import Flask, render_template, jsonify, request, Response
+from data_generator import generate_weather_data, generate_station_metadata
+import backends
+import responses
+from snapshot import SnapshotStore, fingerprint
+from live_updates import UpdateBroadcaster
+import atexit
 import os
+import queue
+import sys
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'weather-analytics-secret-key'
+app.config['COMPRESS_MIN_SIZE'] = responses.MIN_COMPRESS_SIZE
+# Compact JSON even in debug mode; the dashboard never reads it by eye
+app.json.compact = True
 
 # Enable CORS if available (optional, not required for same-origin requests)
 try:
@@ -20,19 +29,117 @@ except ImportError:
 
 # Initialize processor
 processor = None
-use_spark = True
+use_spark = False
+backend_info = None
+
+# Aggregates persisted across restarts, keyed by the data file's fingerprint
+snapshots = SnapshotStore('data/weather_data.csv')
+
+# Default and maximum number of points returned for time series
+DAILY_TEMPERATURE_POINTS = 120
+MAX_SERIES_POINTS = 5000
+
+# Processor backend: 'auto' picks one by dataset size, or force 'pandas' / 'spark'
+app.config['PROCESSOR_BACKEND'] = os.environ.get('WEATHER_BACKEND', 'auto')
+
+def run_analysis(data_file, method):
+    """Return an analysis result, from the snapshot if the data file is unchanged"""
+    # Taken before reading, so a result from a file that changed meanwhile is not stored
+    version = snapshots.current_fingerprint()
+    # Backends differ on edge cases, so results are stored per backend
+    if backend_info is not None:
+        backend = backend_info['name']
+    else:
+        backend = backends.select_backend(data_file, app.config['PROCESSOR_BACKEND'])['name']
+    result = snapshots.get_aggregate(f'{backend}:{method}')
+    if result is None:
+        # Only start the backend when there is something to compute
+        proc = get_processor()
+        df = proc.load_data(data_file)
+        result = getattr(proc, method)(df)
+        snapshots.put_aggregate(f"{backend_info['name']}:{method}", result, version)
+    return result
+
+# Analyses pushed to live dashboards, with the field that identifies each record
+# (None: the dashboard refetches a downsampled series, so only flag the change)
+LIVE_ANALYSES = {
+    'get_temperature_stats_by_location': 'location',
+    'get_max_min_temperature_by_location': 'location',
+    'get_precipitation_by_location': 'location',
+    'get_weather_condition_distribution': 'condition',
+    'get_daily_average_temperature': None,
+    'get_location_statistics': 'location',
+    'get_humidity_by_location': 'location',
+}
+
+def compute_live_analyses():
+    """Compute every live analysis once (shared by all connected dashboards)"""
+    data_file = 'data/weather_data.csv'
+    return {name: run_analysis(data_file, name) for name in LIVE_ANALYSES}
+
+live_updates = UpdateBroadcaster(snapshots.current_fingerprint, compute_live_analyses,
+                                 LIVE_ANALYSES)
+
+def api_response(result):
+    """
+    Return records as JSON, or column by column in the binary format given by ?format=
+    (a single record is sent as a one-row table in binary formats)
+    """
+    fmt = request.args.get('format', 'json')
+    if fmt == 'json':
+        return jsonify(result)
+    if fmt not in responses.available_formats():
+        return jsonify({'error': f"Unsupported format: {fmt}",
+                        'available': responses.available_formats()}), 406
+    records = [result] if isinstance(result, dict) else result
+    data, mimetype = responses.encode_records(records, fmt)
+    return Response(data, mimetype=mimetype)
+
+# Station index and per-station aggregates, rebuilt when either data file changes
+station_cache = {'version': None, 'value': None}
+
+def get_station_aggregates():
+    """Return StationAggregates for the current station metadata and weather data"""
+    from stations import StationIndex, StationAggregates
+    
+    data_file = 'data/weather_data.csv'
+    stations_file = 'data/stations.csv'
+    if not os.path.exists(data_file):
+        generate_weather_data(1000, data_file)
+    if not os.path.exists(stations_file):
+        generate_station_metadata(stations_file)
+    
+    version = (fingerprint(stations_file), snapshots.current_fingerprint())
+    if station_cache['version'] != version:
+        partials = run_analysis(data_file, 'get_location_partials')
+        index = StationIndex.from_csv(stations_file)
+        station_cache['value'] = StationAggregates(index, partials)
+        station_cache['version'] = version
+    return station_cache['value']
 
 def get_processor():
-    """Get or create processor instance (Spark or fallback)"""
-    global processor, use_spark
+    """Get or create processor instance for the selected backend"""
+    global processor, use_spark, backend_info
     
     if processor is None:
-        # Skip Spark, use pandas directly
         try:
-            from fallback_processor import FallbackWeatherProcessor
-            processor = FallbackWeatherProcessor()
-            use_spark = False
-            print("✓ Using Pandas for data processing")
+            info = backends.select_backend('data/weather_data.csv',
+                                           app.config['PROCESSOR_BACKEND'])
+            try:
+                processor = backends.create_processor(info['name'])
+            except Exception as e:
+                # An automatic choice (e.g. Spark without Java) must not take the API down
+                if info['reason'] == 'configured' or info['name'] == 'pandas':
+                    raise
+                print(f"⚠ {backends.backend_label(info['name'])} failed to start ({e}), "
+                      f"falling back to Pandas")
+                processor = backends.create_processor('pandas')
+                info = dict(info, name='pandas',
+                            reason=f"{info['name']} failed to start: {e}")
+            backend_info = info
+            use_spark = info['name'] == 'spark'
+            print(f"✓ Using {backends.backend_label(info['name'])} for data processing "
+                  f"({info['reason']})")
         except Exception as e:
             print(f"✗ Error initializing processor: {e}")
             import traceback
@@ -41,6 +148,14 @@ def get_processor():
     
     return processor
 
+@app.after_request
+def compress_api_response(response):
+    """Compress large API responses with the best encoding the client accepts"""
+    if request.path.startswith('/api/'):
+        responses.compress_response(response, request.headers.get('Accept-Encoding'),
+                                    app.config['COMPRESS_MIN_SIZE'])
+    return response
+
 @app.route('/')
 def index():
     """Main dashboard page"""
@@ -71,32 +186,44 @@ def test_connection():
 @app.route('/api/health')
 def api_health():
     """Health check endpoint"""
+    info = backend_info
+    if info is None:
+        # Report the backend that would be chosen without starting it
+        try:
+            info = backends.select_backend('data/weather_data.csv',
+                                           app.config['PROCESSOR_BACKEND'])
+        except ValueError as e:
+            return jsonify({'status': 'error', 'message': str(e)}), 500
     return jsonify({
         'status': 'ok',
         'message': 'Server is running',
-        'processor': 'Spark' if use_spark else 'Pandas'
+        'ingest': getattr(processor, 'last_ingest_report', None),
+        'processor': backends.backend_label(info['name']),
+        'backend': {
+            'name': info['name'],
+            'reason': info['reason'],
+            'configured': app.config['PROCESSOR_BACKEND'],
+            'estimated_rows': info['estimated_rows'],
+            'cores': info['cores'],
+            'available': backends.available_backends(),
+            'started': backend_info is not None
+        },
+        'live_subscribers': live_updates.subscriber_count()
     })
 
 # API Endpoints
 @app.route('/api/temperature-by-location')
 def api_temperature_by_location():
     """API: Get temperature statistics by location"""
-    global processor, use_spark
+    global processor, use_spark, backend_info
     
     try:
-        proc = get_processor()
         data_file = 'data/weather_data.csv'
         
         if not os.path.exists(data_file):
             generate_weather_data(1000, data_file)
         
-        df = proc.load_data(data_file)
-        
-        # Check if dataframe is empty
-        if df is None:
-            raise ValueError("DataFrame is None")
-        
-        result = proc.get_temperature_stats_by_location(df)
+        result = run_analysis(data_file, 'get_temperature_stats_by_location')
         
         # Validate result
         if result is None:
@@ -105,7 +232,7 @@ def api_temperature_by_location():
         if not isinstance(result, list):
             raise ValueError(f"Result is not a list: {type(result)}")
         
-        return jsonify(result)
+        return api_response(result)
     except Exception as e:
         import traceback
         error_msg = str(e)
@@ -118,16 +245,18 @@ def api_temperature_by_location():
         if use_spark:
             try:
                 print("⚠ Spark failed, attempting to use fallback processor...")
-                from fallback_processor import FallbackWeatherProcessor
-                fallback_proc = FallbackWeatherProcessor()
+                fallback_proc = backends.create_processor('pandas')
                 data_file = 'data/weather_data.csv'
                 df = fallback_proc.load_data(data_file)
                 result = fallback_proc.get_temperature_stats_by_location(df)
                 print("✓ Fallback processor succeeded")
                 # Update global processor to use fallback
+                if processor is not None:
+                    processor.close()
                 processor = fallback_proc
                 use_spark = False
-                return jsonify(result)
+                backend_info = dict(backend_info, name='pandas', reason='spark failed')
+                return api_response(result)
             except Exception as fallback_error:
                 import traceback
                 print(f"✗ Fallback processor also failed: {fallback_error}")
@@ -139,15 +268,13 @@ def api_temperature_by_location():
 def api_max_min_temperature():
     """API: Get max/min temperatures by location"""
     try:
-        proc = get_processor()
         data_file = 'data/weather_data.csv'
         
         if not os.path.exists(data_file):
             generate_weather_data(1000, data_file)
         
-        df = proc.load_data(data_file)
-        result = proc.get_max_min_temperature_by_location(df)
-        return jsonify(result)
+        result = run_analysis(data_file, 'get_max_min_temperature_by_location')
+        return api_response(result)
     except Exception as e:
         import traceback
         error_msg = str(e)
@@ -159,15 +286,13 @@ def api_max_min_temperature():
 def api_precipitation_by_location():
     """API: Get precipitation by location"""
     try:
-        proc = get_processor()
         data_file = 'data/weather_data.csv'
         
         if not os.path.exists(data_file):
             generate_weather_data(1000, data_file)
         
-        df = proc.load_data(data_file)
-        result = proc.get_precipitation_by_location(df)
-        return jsonify(result)
+        result = run_analysis(data_file, 'get_precipitation_by_location')
+        return api_response(result)
     except Exception as e:
         import traceback
         error_msg = str(e)
@@ -179,15 +304,13 @@ def api_precipitation_by_location():
 def api_weather_conditions():
     """API: Get weather condition distribution"""
     try:
-        proc = get_processor()
         data_file = 'data/weather_data.csv'
         
         if not os.path.exists(data_file):
             generate_weather_data(1000, data_file)
         
-        df = proc.load_data(data_file)
-        result = proc.get_weather_condition_distribution(df)
-        return jsonify(result)
+        result = run_analysis(data_file, 'get_weather_condition_distribution')
+        return api_response(result)
     except Exception as e:
         import traceback
         error_msg = str(e)
@@ -197,20 +320,27 @@ def api_weather_conditions():
 
 @app.route('/api/daily-temperature')
 def api_daily_temperature():
-    """API: Get daily average temperature"""
+    """API: Get daily average temperature, downsampled (?points=120&method=lttb|minmax)"""
     try:
-        proc = get_processor()
         data_file = 'data/weather_data.csv'
         
         if not os.path.exists(data_file):
             generate_weather_data(1000, data_file)
         
-        df = proc.load_data(data_file)
-        result = proc.get_daily_average_temperature(df)
-        # Limit to last 30 days for performance
-        if result and len(result) > 30:
-            return jsonify(result[-30:])
-        return jsonify(result)
+        result = run_analysis(data_file, 'get_daily_average_temperature')
+        
+        # Reduce the full history to a bounded number of points for the chart
+        try:
+            points = min(max(int(request.args.get('points', DAILY_TEMPERATURE_POINTS)), 3),
+                         MAX_SERIES_POINTS)
+        except ValueError:
+            return jsonify({'error': 'points must be an integer'}), 400
+        method = request.args.get('method', 'lttb')
+        if method not in ('lttb', 'minmax'):
+            return jsonify({'error': 'method must be lttb or minmax'}), 400
+        
+        from downsample import downsample_records
+        return api_response(downsample_records(result, 'date', 'avg_temperature', points, method))
     except Exception as e:
         import traceback
         error_msg = str(e)
@@ -222,15 +352,13 @@ def api_daily_temperature():
 def api_location_statistics():
     """API: Get comprehensive statistics by location"""
     try:
-        proc = get_processor()
         data_file = 'data/weather_data.csv'
         
         if not os.path.exists(data_file):
             generate_weather_data(1000, data_file)
         
-        df = proc.load_data(data_file)
-        result = proc.get_location_statistics(df)
-        return jsonify(result)
+        result = run_analysis(data_file, 'get_location_statistics')
+        return api_response(result)
     except Exception as e:
         import traceback
         error_msg = str(e)
@@ -241,32 +369,204 @@ def api_location_statistics():
 @app.route('/api/humidity-by-location')
 def api_humidity_by_location():
     """API: Get humidity by location"""
+    try:
+        data_file = 'data/weather_data.csv'
+        
+        if not os.path.exists(data_file):
+            generate_weather_data(1000, data_file)
+        
+        result = run_analysis(data_file, 'get_humidity_by_location')
+        return api_response(result)
+    except Exception as e:
+        import traceback
+        error_msg = str(e)
+        traceback.print_exc()
+        print(f"Error in api_humidity_by_location: {error_msg}")
+        return jsonify({'error': error_msg}), 500
+
+@app.route('/api/stations')
+def api_stations():
+    """API: Station metadata (id, name, lat/lon, region)"""
+    try:
+        aggregates = get_station_aggregates()
+        index = aggregates.index
+        return api_response(index.describe(range(len(index))))
+    except Exception as e:
+        import traceback
+        error_msg = str(e)
+        traceback.print_exc()
+        print(f"Error in api_stations: {error_msg}")
+        return jsonify({'error': error_msg}), 500
+
+@app.route('/api/regions')
+def api_regions():
+    """API: Combined statistics per region"""
+    try:
+        aggregates = get_station_aggregates()
+        result = [dict(region=region, **aggregates.combine(members))
+                  for region, members in aggregates.index.by_region.items()]
+        return api_response(result)
+    except Exception as e:
+        import traceback
+        error_msg = str(e)
+        traceback.print_exc()
+        print(f"Error in api_regions: {error_msg}")
+        return jsonify({'error': error_msg}), 500
+
+@app.route('/api/stations/aggregate')
+def api_station_aggregate():
+    """API: Combined statistics for ?region=<name> or ?bbox=min_lat,min_lon,max_lat,max_lon"""
+    try:
+        aggregates = get_station_aggregates()
+        index = aggregates.index
+        region = request.args.get('region')
+        bbox = request.args.get('bbox')
+        try:
+            if region and bbox:
+                raise ValueError("Use either region or bbox, not both")
+            if region:
+                members = index.in_region(region)
+            elif bbox:
+                values = [float(v) for v in bbox.split(',')]
+                if len(values) != 4:
+                    raise ValueError("bbox must be min_lat,min_lon,max_lat,max_lon")
+                members = index.in_bbox(*values)
+            else:
+                members = range(len(index))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        result = aggregates.combine(members)
+        result['stations'] = [index.names[i] for i in members]
+        return api_response(result)
+    except Exception as e:
+        import traceback
+        error_msg = str(e)
+        traceback.print_exc()
+        print(f"Error in api_station_aggregate: {error_msg}")
+        return jsonify({'error': error_msg}), 500
+
+@app.route('/api/stations/nearest')
+def api_nearest_stations():
+    """API: The ?n= (default 5) stations nearest to ?lat=&lon=, with their statistics"""
+    try:
+        aggregates = get_station_aggregates()
+        try:
+            lat = float(request.args['lat'])
+            lon = float(request.args['lon'])
+            n = int(request.args.get('n', 5))
+        except (KeyError, ValueError):
+            return jsonify({'error': 'lat and lon (numbers) are required; n must be an integer'}), 400
+        
+        indices, distances = aggregates.index.nearest(lat, lon, n)
+        result = []
+        for station, i, distance in zip(aggregates.index.describe(indices), indices, distances):
+            station['distance_km'] = round(float(distance), 1)
+            station.update(aggregates.combine([i]))
+            del station['station_count']
+            result.append(station)
+        return api_response(result)
+    except Exception as e:
+        import traceback
+        error_msg = str(e)
+        traceback.print_exc()
+        print(f"Error in api_nearest_stations: {error_msg}")
+        return jsonify({'error': error_msg}), 500
+
+@app.route('/api/stations/grid')
+def api_station_grid():
+    """API: Combined statistics per grid cell of ?cell_deg= degrees (default 5)"""
+    try:
+        aggregates = get_station_aggregates()
+        try:
+            cell_deg = float(request.args.get('cell_deg', 5))
+            if not 0 < cell_deg <= 180:
+                raise ValueError
+        except ValueError:
+            return jsonify({'error': 'cell_deg must be a number between 0 and 180'}), 400
+        
+        result = []
+        for (row, col), members in sorted(aggregates.index.grid_cells(cell_deg).items()):
+            cell = {'min_lat': row * cell_deg, 'min_lon': col * cell_deg, 'cell_deg': cell_deg}
+            cell.update(aggregates.combine(members))
+            result.append(cell)
+        return api_response(result)
+    except Exception as e:
+        import traceback
+        error_msg = str(e)
+        traceback.print_exc()
+        print(f"Error in api_station_grid: {error_msg}")
+        return jsonify({'error': error_msg}), 500
+
+@app.route('/api/stream')
+def api_stream():
+    """API: Server-Sent Events stream of aggregate changes ('update' and 'resync' events)"""
+    client = live_updates.subscribe()
+    
+    def events():
+        try:
+            yield 'retry: 5000\n\n'
+            while True:
+                try:
+                    yield client.get(timeout=15)
+                except queue.Empty:
+                    # Comment line keeps proxies from closing an idle connection
+                    yield ': keep-alive\n\n'
+        finally:
+            live_updates.unsubscribe(client)
+    
+    return Response(events(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/aggregate')
+def api_aggregate():
+    """API: Ad-hoc aggregation, e.g. ?group_by=location&metric=humidity&agg=max&condition=Rainy"""
     try:
         proc = get_processor()
+        if not hasattr(proc, 'aggregate'):
+            return jsonify({'error': f"Ad-hoc aggregation is not supported by the "
+                                     f"{backends.backend_label(backend_info['name'])} backend"}), 501
+        
         data_file = 'data/weather_data.csv'
         
         if not os.path.exists(data_file):
             generate_weather_data(1000, data_file)
         
+        group_by = request.args.get('group_by', 'location')
+        metric = request.args.get('metric', 'temperature')
+        agg = request.args.get('agg', 'avg')
+        filters = {key: value for key, value in request.args.items()
+                   if key not in ('group_by', 'metric', 'agg', 'format')}
+        try:
+            backends.validate_aggregate(group_by, metric, agg, filters)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         df = proc.load_data(data_file)
-        result = proc.get_humidity_by_location(df)
-        return jsonify(result)
+        result = proc.aggregate(df, group_by, metric, agg, filters)
+        return api_response(result)
     except Exception as e:
         import traceback
         error_msg = str(e)
         traceback.print_exc()
-        print(f"Error in api_humidity_by_location: {error_msg}")
+        print(f"Error in api_aggregate: {error_msg}")
         return jsonify({'error': error_msg}), 500
 
-@app.teardown_appcontext
-def close_processor(error):
-    """Close Spark processor on app teardown"""
+@atexit.register
+def close_processor():
+    """Close processor (and its Spark session) when the server exits"""
     global processor
     if processor is not None:
         processor.close()
         processor = None
 
 if __name__ == '__main__':
+    if '--startup-report' in sys.argv:
+        # Measure import/initialization cost per module instead of starting the server
+        import startup_report
+        startup_report.print_report(startup_report.collect())
+        sys.exit(0)
+    
     # Create data directory if it doesn't exist
     os.makedirs('data', exist_ok=True)
     
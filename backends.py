@@ -0,0 +1,176 @@
+"""
+Processor Backend Registry
+Chooses between the pandas, DuckDB and Spark processors based on dataset size and CPU cores
+"""
+import importlib
+import importlib.util
+import os
+
+# Every backend must implement these methods (see FallbackWeatherProcessor)
+PROCESSOR_METHODS = (
+    'load_data',
+    'get_temperature_stats_by_location',
+    'get_max_min_temperature_by_location',
+    'get_precipitation_by_location',
+    'get_weather_condition_distribution',
+    'get_daily_average_temperature',
+    'get_location_statistics',
+    'get_humidity_by_location',
+    'get_location_partials',
+    'close',
+)
+
+# Whitelists for ad-hoc aggregations (see validate_aggregate)
+AGGREGATE_DIMENSIONS = ('location', 'condition', 'date')
+AGGREGATE_METRICS = ('temperature', 'humidity', 'precipitation', 'wind_speed')
+AGGREGATE_FUNCTIONS = ('avg', 'min', 'max', 'sum', 'count')
+AGGREGATE_FILTERS = ('location', 'condition', 'start_date', 'end_date')
+
+# Approximate size of one CSV row, used to estimate rows without reading the file
+BYTES_PER_ROW = 48
+
+# Datasets at or above this many rows are handed to a parallel backend
+LARGE_DATASET_ROWS = 5_000_000
+
+# A parallel backend only pays off its startup cost with enough cores
+MIN_PARALLEL_CORES = 4
+
+_backends = {}
+
+
+def register_backend(name, module, class_name, label, requires=(), parallel=False):
+    """
+    Register a processor backend
+
+    Args:
+        name: Backend name used in config and /api/health
+        module: Module that defines the processor class
+        class_name: Processor class name
+        label: Human readable name
+        requires: Top-level packages that must be importable
+        parallel: True if the backend scales across cores
+    """
+    _backends[name] = {
+        'module': module,
+        'class_name': class_name,
+        'label': label,
+        'requires': tuple(requires),
+        'parallel': parallel,
+    }
+
+
+register_backend('pandas', 'fallback_processor', 'FallbackWeatherProcessor',
+                 'Pandas', requires=('pandas',))
+# Parallel backends are tried in registration order, so DuckDB is preferred over Spark
+register_backend('duckdb', 'duckdb_processor', 'DuckDBWeatherProcessor',
+                 'DuckDB', requires=('duckdb',), parallel=True)
+register_backend('spark', 'spark_processor', 'WeatherDataProcessor',
+                 'Spark', requires=('pyspark',), parallel=True)
+
+
+def backend_label(name):
+    """Return the human readable name of a backend"""
+    return _backends[name]['label']
+
+
+def backend_module(name):
+    """Return the module that implements a backend"""
+    return _backends[name]['module']
+
+
+def is_available(name):
+    """Check whether a backend's packages are installed (without importing them)"""
+    spec = _backends[name]
+    return all(importlib.util.find_spec(pkg) is not None for pkg in spec['requires'])
+
+
+def available_backends():
+    """List registered backends that can be used in this environment"""
+    return [name for name in _backends if is_available(name)]
+
+
+def estimate_rows(file_path):
+    """Estimate the number of records in a CSV file from its size"""
+    if not os.path.exists(file_path):
+        return 0
+    return os.path.getsize(file_path) // BYTES_PER_ROW
+
+
+def select_backend(file_path, override=None):
+    """
+    Choose a backend for a data file
+
+    Args:
+        file_path: Path to the weather CSV file
+        override: Backend name from config, or None/'auto' for automatic choice
+
+    Returns:
+        dict with the backend name and the reason it was chosen
+    """
+    rows = estimate_rows(file_path)
+    cores = os.cpu_count() or 1
+    info = {'estimated_rows': rows, 'cores': cores}
+
+    if override and override != 'auto':
+        if override not in _backends:
+            raise ValueError(f"Unknown processor backend: {override} "
+                             f"(choose from {', '.join(_backends)})")
+        if not is_available(override):
+            raise ValueError(f"Processor backend '{override}' is not installed")
+        info.update(name=override, reason='configured')
+        return info
+
+    if rows >= LARGE_DATASET_ROWS and cores >= MIN_PARALLEL_CORES:
+        for name, spec in _backends.items():
+            if spec['parallel'] and is_available(name):
+                info.update(name=name, reason='large dataset')
+                return info
+
+    if rows < LARGE_DATASET_ROWS:
+        reason = 'small dataset'
+    elif cores < MIN_PARALLEL_CORES:
+        reason = 'too few cores for a parallel backend'
+    else:
+        reason = 'no parallel backend installed'
+    info.update(name='pandas', reason=reason)
+    return info
+
+
+def validate_aggregate(group_by, metric, agg, filters):
+    """
+    Validate an ad-hoc aggregation request against the whitelists
+
+    Args:
+        group_by: Dimension column to group by
+        metric: Numeric column to aggregate
+        agg: Aggregate function name
+        filters: dict of filter name -> value; empty values are dropped
+
+    Returns:
+        dict of the filters that are set
+
+    Raises:
+        ValueError: If any argument is not allowed
+    """
+    if group_by not in AGGREGATE_DIMENSIONS:
+        raise ValueError(f"group_by must be one of: {', '.join(AGGREGATE_DIMENSIONS)}")
+    if metric not in AGGREGATE_METRICS:
+        raise ValueError(f"metric must be one of: {', '.join(AGGREGATE_METRICS)}")
+    if agg not in AGGREGATE_FUNCTIONS:
+        raise ValueError(f"agg must be one of: {', '.join(AGGREGATE_FUNCTIONS)}")
+    unknown = set(filters) - set(AGGREGATE_FILTERS)
+    if unknown:
+        raise ValueError(f"Unknown filters: {', '.join(sorted(unknown))}")
+    return {key: value for key, value in filters.items() if value}
+
+
+def create_processor(name):
+    """Import and instantiate a backend, checking it implements the processor interface"""
+    spec = _backends[name]
+    module = importlib.import_module(spec['module'])
+    processor = getattr(module, spec['class_name'])()
+
+    missing = [m for m in PROCESSOR_METHODS if not callable(getattr(processor, m, None))]
+    if missing:
+        raise TypeError(f"{spec['class_name']} is missing processor methods: {', '.join(missing)}")
+    return processor
@@ -7,6 +7,38 @@ import random
 from datetime import datetime, timedelta
 import os
 
+# Station metadata for the generated locations: (name, latitude, longitude, region)
+STATIONS = [
+    ('New York', 40.7128, -74.0060, 'Northeast'),
+    ('Los Angeles', 34.0522, -118.2437, 'West'),
+    ('Chicago', 41.8781, -87.6298, 'Midwest'),
+    ('Houston', 29.7604, -95.3698, 'South'),
+    ('Phoenix', 33.4484, -112.0740, 'West'),
+    ('Philadelphia', 39.9526, -75.1652, 'Northeast'),
+    ('San Antonio', 29.4241, -98.4936, 'South'),
+    ('San Diego', 32.7157, -117.1611, 'West'),
+    ('Dallas', 32.7767, -96.7970, 'South'),
+    ('San Jose', 37.3382, -121.8863, 'West'),
+]
+
+def generate_station_metadata(output_file='data/stations.csv'):
+    """
+    Write station metadata (id, name, lat, lon, region) for the generated locations
+    
+    Args:
+        output_file: Output CSV file path
+    """
+    os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+    
+    with open(output_file, 'w', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(['station_id', 'name', 'lat', 'lon', 'region'])
+        for station_id, (name, lat, lon, region) in enumerate(STATIONS, start=1):
+            writer.writerow([station_id, name, lat, lon, region])
+    
+    print(f"Generated {len(STATIONS)} stations in {output_file}")
+    return output_file
+
 def generate_weather_data(num_records=1000, output_file='data/weather_data.csv'):
     """
     Generate sample weather data
@@ -18,8 +50,7 @@ def generate_weather_data(num_records=1000, output_file='data/weather_data.csv')
     # Create data directory if it doesn't exist
     os.makedirs('data', exist_ok=True)
     
-    locations = ['New York', 'Los Angeles', 'Chicago', 'Houston', 'Phoenix', 
-                 'Philadelphia', 'San Antonio', 'San Diego', 'Dallas', 'San Jose']
+    locations = [name for name, _, _, _ in STATIONS]
     
     weather_conditions = ['Sunny', 'Cloudy', 'Rainy', 'Snowy', 'Foggy', 'Windy']
     
@@ -74,6 +105,7 @@ def generate_weather_data(num_records=1000, output_file='data/weather_data.csv')
 
 if __name__ == '__main__':
     generate_weather_data(1000)
+    generate_station_metadata()
 
 
 
@@ -0,0 +1,107 @@
+"""
+Time Series Downsampling
+Reduces a series to a fixed number of points while keeping its visual shape
+"""
+import numpy as np
+
+
+def lttb(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets downsampling
+
+    Keeps the first and last points, and from each of the n_out - 2 buckets in
+    between the point that forms the largest triangle with the point kept from
+    the previous bucket and the average of the next bucket.
+
+    Args:
+        x: Sorted x values (e.g. days since epoch)
+        y: y values
+        n_out: Number of points to keep (at least 3)
+
+    Returns:
+        numpy array of the indices of the points to keep
+    """
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Bucket boundaries for the points between the first and the last
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    starts, ends = edges[:-1], edges[1:]
+
+    # Average of every bucket, with the last point as the "next bucket" of the last one
+    sums_x = np.add.reduceat(x[1:n - 1], starts - 1)
+    sums_y = np.add.reduceat(y[1:n - 1], starts - 1)
+    counts = ends - starts
+    avg_x = np.append(sums_x / counts, x[-1])
+    avg_y = np.append(sums_y / counts, y[-1])
+
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    prev = 0
+    for i, (start, end) in enumerate(zip(starts, ends)):
+        # Twice the triangle area for every candidate in the bucket at once
+        bx, by = x[start:end], y[start:end]
+        area = np.abs((x[prev] - avg_x[i + 1]) * (by - y[prev])
+                      - (x[prev] - bx) * (avg_y[i + 1] - y[prev]))
+        prev = start + int(np.argmax(area))
+        keep[i + 1] = prev
+    return keep
+
+
+def min_max(y, n_out):
+    """
+    Min/max bucketing: keep the lowest and highest point of each bucket
+
+    Args:
+        y: y values
+        n_out: Number of points to keep (rounded down to an even number)
+
+    Returns:
+        numpy array of the indices of the points to keep, in order
+    """
+    y = np.asarray(y, dtype='float64')
+    n = len(y)
+    buckets = n_out // 2
+    if n_out >= n or buckets < 1:
+        return np.arange(n)
+
+    starts = np.linspace(0, n, buckets + 1).astype(np.int64)[:-1]
+    bucket_of = np.repeat(np.arange(buckets), np.diff(np.append(starts, n)))
+
+    # Per-bucket extremes, then the first index in each bucket that hits them
+    picks = []
+    for extreme in (np.minimum.reduceat(y, starts), np.maximum.reduceat(y, starts)):
+        hits = np.flatnonzero(y == extreme[bucket_of])
+        _, first = np.unique(bucket_of[hits], return_index=True)
+        picks.append(hits[first])
+    return np.unique(np.concatenate(picks))
+
+
+def downsample_records(records, x_key, y_key, n_out, method='lttb'):
+    """
+    Downsample a list of {x_key: ..., y_key: ...} dictionaries
+
+    Args:
+        records: Records sorted by x_key; x_key values are 'YYYY-MM-DD' dates
+        x_key: Date field
+        y_key: Numeric field
+        n_out: Maximum number of records to return
+        method: 'lttb' or 'minmax'
+
+    Returns:
+        List with at most n_out of the original records, in order
+    """
+    if len(records) <= n_out:
+        return records
+    y = np.array([r[y_key] for r in records], dtype='float64')
+    if method == 'minmax':
+        keep = min_max(y, n_out)
+    elif method == 'lttb':
+        x = np.array([r[x_key] for r in records], dtype='datetime64[D]').astype('float64')
+        keep = lttb(x, y, n_out)
+    else:
+        raise ValueError(f"Unknown downsampling method: {method} (choose lttb or minmax)")
+    return [records[i] for i in keep]
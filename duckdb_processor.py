@@ -0,0 +1,195 @@
+"""
+DuckDB Processor for Weather Data Analysis
+Runs each analysis as SQL on an embedded, multi-threaded vectorized engine
+"""
+import duckdb
+import os
+import threading
+
+from backends import validate_aggregate
+from schema import REQUIRED_COLUMNS, VALID_RANGES
+
+# Explicit column types so DuckDB does not have to sniff them
+CSV_COLUMNS = {
+    'date': 'VARCHAR',
+    'location': 'VARCHAR',
+    'temperature': 'DOUBLE',
+    'humidity': 'DOUBLE',
+    'precipitation': 'DOUBLE',
+    'wind_speed': 'DOUBLE',
+    'condition': 'VARCHAR',
+}
+
+class DuckDBWeatherProcessor:
+    """Process weather data with SQL queries on DuckDB"""
+
+    def __init__(self):
+        """Open an in-memory DuckDB database"""
+        self.conn = duckdb.connect(database=':memory:')
+        self._lock = threading.Lock()
+        self._view_source = None
+
+    def load_data(self, file_path):
+        """
+        Expose a CSV or Parquet file as a SQL view
+
+        Args:
+            file_path: Path to CSV or Parquet file
+
+        Returns:
+            Name of the view to query
+        """
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"Weather data file not found: {file_path}")
+
+        # DDL cannot take bound parameters, so quote the path as a SQL literal
+        path = "'" + file_path.replace("'", "''") + "'"
+        if file_path.endswith('.parquet'):
+            source = f"read_parquet({path})"
+        else:
+            columns = ', '.join(f"'{name}': '{sql_type}'" for name, sql_type in CSV_COLUMNS.items())
+            # Unparseable rows are skipped rather than failing the whole query
+            source = f"read_csv({path}, header = true, columns = {{{columns}}}, ignore_errors = true)"
+
+        # Same validity rules as the pandas ingest stage; failing rows are dropped, not quarantined
+        conditions = [f"{column} IS NOT NULL" for column in REQUIRED_COLUMNS]
+        conditions.append("try_strptime(CAST(date AS VARCHAR), '%Y-%m-%d') IS NOT NULL")
+        for column, (low, high) in VALID_RANGES.items():
+            if low is not None:
+                conditions.append(f"({column} IS NULL OR {column} >= {low})")
+            if high is not None:
+                conditions.append(f"({column} IS NULL OR {column} <= {high})")
+
+        # The view reads the file lazily, so it only has to be (re)created when the path changes
+        with self._lock:
+            if self._view_source != file_path:
+                self.conn.cursor().execute(
+                    f"CREATE OR REPLACE VIEW weather AS SELECT * FROM {source} "
+                    f"WHERE {' AND '.join(conditions)}"
+                )
+                self._view_source = file_path
+        return 'weather'
+
+    def _query(self, sql, params=None):
+        """Run a query and return the rows as a list of dictionaries"""
+        # A cursor per query: request threads must not share one result set
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(sql, params or [])
+            columns = [desc[0] for desc in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+
+    def get_temperature_stats_by_location(self, df):
+        """Calculate temperature statistics by location"""
+        return self._query(f"""
+            SELECT location, round(avg(temperature), 2) AS avg_temperature, count(*) AS count
+            FROM {df} GROUP BY location ORDER BY location
+        """)
+
+    def get_max_min_temperature_by_location(self, df):
+        """Get max and min temperatures by location"""
+        return self._query(f"""
+            SELECT location,
+                   round(max(temperature), 2) AS max_temperature,
+                   round(min(temperature), 2) AS min_temperature
+            FROM {df} GROUP BY location ORDER BY location
+        """)
+
+    def get_precipitation_by_location(self, df):
+        """Calculate total precipitation by location"""
+        return self._query(f"""
+            SELECT location, round(sum(precipitation), 2) AS total_precipitation
+            FROM {df} GROUP BY location ORDER BY location
+        """)
+
+    def get_weather_condition_distribution(self, df):
+        """Count weather conditions"""
+        return self._query(f"""
+            SELECT condition, count(*) AS count
+            FROM {df} GROUP BY condition ORDER BY count DESC
+        """)
+
+    def get_daily_average_temperature(self, df):
+        """Calculate daily average temperature"""
+        return self._query(f"""
+            SELECT date, round(avg(temperature), 2) AS avg_temperature
+            FROM {df} GROUP BY date ORDER BY date
+        """)
+
+    def get_location_statistics(self, df):
+        """Get comprehensive statistics by location"""
+        return self._query(f"""
+            SELECT location,
+                   round(avg(temperature), 2) AS avg_temperature,
+                   round(max(temperature), 2) AS max_temperature,
+                   round(min(temperature), 2) AS min_temperature,
+                   round(avg(humidity), 2) AS avg_humidity,
+                   round(avg(precipitation), 2) AS avg_precipitation,
+                   round(avg(wind_speed), 2) AS avg_wind_speed,
+                   count(*) AS record_count
+            FROM {df} GROUP BY location ORDER BY location
+        """)
+
+    def get_humidity_by_location(self, df):
+        """Calculate average humidity by location"""
+        return self._query(f"""
+            SELECT location, round(avg(humidity), 2) AS avg_humidity
+            FROM {df} GROUP BY location ORDER BY location
+        """)
+
+    def get_location_partials(self, df):
+        """Get unrounded per-location sums, counts and extremes that can be merged across stations"""
+        return self._query(f"""
+            SELECT location,
+                   count(*) AS record_count,
+                   sum(temperature) AS temperature_sum,
+                   count(temperature) AS temperature_count,
+                   min(temperature) AS temperature_min,
+                   max(temperature) AS temperature_max,
+                   sum(humidity) AS humidity_sum,
+                   count(humidity) AS humidity_count,
+                   sum(precipitation) AS precipitation_sum,
+                   count(precipitation) AS precipitation_count,
+                   sum(wind_speed) AS wind_speed_sum,
+                   count(wind_speed) AS wind_speed_count
+            FROM {df} GROUP BY location ORDER BY location
+        """)
+
+    def aggregate(self, df, group_by, metric, agg, filters=None):
+        """
+        Run an ad-hoc aggregation
+
+        Args:
+            df: View name returned by load_data
+            group_by: Dimension to group by (see backends.AGGREGATE_DIMENSIONS)
+            metric: Column to aggregate (see backends.AGGREGATE_METRICS)
+            agg: Aggregate function (see backends.AGGREGATE_FUNCTIONS)
+            filters: Optional dict with location, condition, start_date, end_date
+
+        Returns:
+            List of {group_by: value, '<agg>_<metric>': value} sorted by group
+        """
+        filters = validate_aggregate(group_by, metric, agg, filters or {})
+
+        # Identifiers come from the whitelists; filter values are bound parameters
+        clauses = []
+        params = []
+        for key, op, column in (('location', '=', 'location'),
+                                ('condition', '=', 'condition'),
+                                ('start_date', '>=', 'date'),
+                                ('end_date', '<=', 'date')):
+            if key in filters:
+                clauses.append(f"{column} {op} ?")
+                params.append(filters[key])
+        where = ('WHERE ' + ' AND '.join(clauses)) if clauses else ''
+
+        return self._query(f"""
+            SELECT {group_by}, round({agg}({metric}), 2) AS {agg}_{metric}
+            FROM {df} {where} GROUP BY {group_by} ORDER BY {group_by}
+        """, params)
+
+    def close(self):
+        """Close DuckDB connection"""
+        self.conn.close()
@@ -2,19 +2,38 @@
 Fallback Processor using Pandas (when Spark is not available)
 Provides same interface as SparkProcessor but uses pandas for processing
 """
+import numpy as np
 import pandas as pd
+import operator
 import os
 
+from backends import validate_aggregate
+from ingest import load_weather_csv
+from snapshot import SnapshotStore
+
+def _compare(series, op, value):
+    """
+    Compare a column with a value; text memory-mapped from a snapshot is categorical,
+    so it is compared once per distinct value and mapped back through the codes
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Code -1 (missing) picks the trailing False
+        hits = np.append(op(series.cat.categories, value), False)
+        return pd.Series(hits[series.cat.codes.to_numpy()], index=series.index)
+    return op(series, value)
+
 class FallbackWeatherProcessor:
     """Process weather data using pandas (fallback when Spark is unavailable)"""
     
     def __init__(self):
         """Initialize processor"""
-        pass
+        self.last_ingest_report = None
+        self._snapshots = {}
+        self._loaded = None
     
     def load_data(self, file_path):
         """
-        Load weather data from CSV file
+        Load weather data from CSV file, validated against the ingest schema
         
         Args:
             file_path: Path to CSV file
@@ -25,19 +44,33 @@ class FallbackWeatherProcessor:
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"Weather data file not found: {file_path}")
         
-        df = pd.read_csv(file_path)
+        store = self._snapshots.setdefault(file_path, SnapshotStore(file_path))
+        current = store.current_fingerprint()
+        if self._loaded is not None and self._loaded[:2] == (file_path, current):
+            return self._loaded[2]
+        
+        # Columns saved by an earlier run are memory-mapped instead of re-parsing the CSV
+        df, report = store.load_frame()
+        if df is None:
+            df, report = load_weather_csv(file_path)
+            if report['quarantined_rows']:
+                print(f"⚠ Quarantined {report['quarantined_rows']} invalid rows to "
+                      f"{report['quarantine_file']}: {report['reasons']}")
+            store.save_frame(df, current, metadata=report)
+        self.last_ingest_report = report
+        self._loaded = (file_path, current, df)
         return df
     
     def get_temperature_stats_by_location(self, df):
         """Calculate temperature statistics by location"""
-        result = df.groupby('location')['temperature'].agg(['mean', 'count']).reset_index()
+        result = df.groupby('location', observed=True)['temperature'].agg(['mean', 'count']).reset_index()
         result.columns = ['location', 'avg_temperature', 'count']
         result['avg_temperature'] = result['avg_temperature'].round(2)
         return result.to_dict('records')
     
     def get_max_min_temperature_by_location(self, df):
         """Get max and min temperatures by location"""
-        result = df.groupby('location')['temperature'].agg(['max', 'min']).reset_index()
+        result = df.groupby('location', observed=True)['temperature'].agg(['max', 'min']).reset_index()
         result.columns = ['location', 'max_temperature', 'min_temperature']
         result['max_temperature'] = result['max_temperature'].round(2)
         result['min_temperature'] = result['min_temperature'].round(2)
@@ -45,7 +78,7 @@ class FallbackWeatherProcessor:
     
     def get_precipitation_by_location(self, df):
         """Calculate total precipitation by location"""
-        result = df.groupby('location')['precipitation'].sum().reset_index()
+        result = df.groupby('location', observed=True)['precipitation'].sum().reset_index()
         result.columns = ['location', 'total_precipitation']
         result['total_precipitation'] = result['total_precipitation'].round(2)
         return result.to_dict('records')
@@ -58,7 +91,7 @@ class FallbackWeatherProcessor:
     
     def get_daily_average_temperature(self, df):
         """Calculate daily average temperature"""
-        result = df.groupby('date')['temperature'].mean().reset_index()
+        result = df.groupby('date', observed=True)['temperature'].mean().reset_index()
         result.columns = ['date', 'avg_temperature']
         result['avg_temperature'] = result['avg_temperature'].round(2)
         result = result.sort_values('date')
@@ -66,7 +99,7 @@ class FallbackWeatherProcessor:
     
     def get_location_statistics(self, df):
         """Get comprehensive statistics by location"""
-        result = df.groupby('location').agg({
+        result = df.groupby('location', observed=True).agg({
             'temperature': ['mean', 'max', 'min'],
             'humidity': 'mean',
             'precipitation': 'mean',
@@ -88,11 +121,51 @@ class FallbackWeatherProcessor:
     
     def get_humidity_by_location(self, df):
         """Calculate average humidity by location"""
-        result = df.groupby('location')['humidity'].mean().reset_index()
+        result = df.groupby('location', observed=True)['humidity'].mean().reset_index()
         result.columns = ['location', 'avg_humidity']
         result['avg_humidity'] = result['avg_humidity'].round(2)
         return result.to_dict('records')
     
+    def get_location_partials(self, df):
+        """Get unrounded per-location sums, counts and extremes that can be merged across stations"""
+        result = df.groupby('location', observed=True).agg(
+            record_count=('location', 'size'),
+            temperature_sum=('temperature', 'sum'),
+            temperature_count=('temperature', 'count'),
+            temperature_min=('temperature', 'min'),
+            temperature_max=('temperature', 'max'),
+            humidity_sum=('humidity', 'sum'),
+            humidity_count=('humidity', 'count'),
+            precipitation_sum=('precipitation', 'sum'),
+            precipitation_count=('precipitation', 'count'),
+            wind_speed_sum=('wind_speed', 'sum'),
+            wind_speed_count=('wind_speed', 'count')
+        ).reset_index()
+        return result.to_dict('records')
+    
+    def aggregate(self, df, group_by, metric, agg, filters=None):
+        """
+        Run an ad-hoc aggregation (same contract as DuckDBWeatherProcessor.aggregate)
+        
+        Returns:
+            List of {group_by: value, '<agg>_<metric>': value} sorted by group
+        """
+        filters = validate_aggregate(group_by, metric, agg, filters or {})
+        
+        mask = pd.Series(True, index=df.index)
+        for key, op, column in (('location', operator.eq, 'location'),
+                                ('condition', operator.eq, 'condition'),
+                                ('start_date', operator.ge, 'date'),
+                                ('end_date', operator.le, 'date')):
+            if key in filters:
+                mask &= _compare(df[column], op, filters[key])
+        
+        func = 'mean' if agg == 'avg' else agg
+        result = df[mask].groupby(group_by, observed=True)[metric].agg(func).reset_index()
+        result.columns = [group_by, f'{agg}_{metric}']
+        result[f'{agg}_{metric}'] = result[f'{agg}_{metric}'].round(2)
+        return result.to_dict('records')
+    
     def close(self):
         """Close processor (no-op for pandas)"""
         pass
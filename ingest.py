@@ -0,0 +1,197 @@
+"""
+Weather Data Ingestion
+Loads CSV files with an explicit schema and moves invalid rows to a quarantine file
+"""
+import csv
+import importlib.util
+import os
+import numpy as np
+import pandas as pd
+
+from schema import SCHEMA, NUMERIC_COLUMNS, REQUIRED_COLUMNS, VALID_RANGES
+
+QUARANTINE_DIR = 'data/quarantine'
+
+# First pandas release that hands bad lines to a callable with the pyarrow engine
+PYARROW_BAD_LINES_PANDAS = (2, 2)
+
+
+def csv_engine():
+    """
+    Return the fastest CSV parser that can report malformed lines: 'pyarrow' when it
+    is installed and pandas is new enough, otherwise pandas' 'c' parser
+    """
+    if importlib.util.find_spec('pyarrow') is None:
+        return 'c'
+    version = tuple(int(part) for part in pd.__version__.split('.')[:2])
+    return 'pyarrow' if version >= PYARROW_BAD_LINES_PANDAS else 'c'
+
+
+def _read_csv(file_path, engine, dtype, malformed):
+    """
+    read_csv that skips lines with the wrong number of fields instead of failing,
+    appending their text to the malformed list
+    """
+    if engine == 'pyarrow':
+        def skip(row):
+            malformed.append(row.text)
+            return 'skip'
+        return pd.read_csv(file_path, dtype=dtype, engine='pyarrow', on_bad_lines=skip)
+    try:
+        df = pd.read_csv(file_path, dtype=dtype, engine='c')
+    except pd.errors.ParserError:
+        # Rows with extra fields: only the python parser hands them to a callable
+        df = pd.read_csv(file_path, dtype=dtype, engine='python',
+                         on_bad_lines=lambda fields: malformed.append(','.join(fields)))
+    return _drop_short_rows(df, file_path, malformed)
+
+
+def _drop_short_rows(df, file_path, malformed):
+    """
+    Move rows with too few fields to the malformed list
+
+    The C and python parsers pad short rows with NaN instead of reporting them,
+    so the fields of each line are counted to match the pyarrow engine.
+    """
+    # A short row always lacks the last column; skip the scan when none does
+    if df.empty or not df[df.columns[-1]].isna().any():
+        return df
+
+    n_columns = len(df.columns)
+    short = []
+    short_lines = []
+    with open(file_path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        for fields in reader:
+            # Blank lines and rows with extra fields are not in the DataFrame
+            if not fields or len(fields) > n_columns:
+                continue
+            short.append(len(fields) < n_columns)
+            if short[-1]:
+                short_lines.append(','.join(fields))
+    if len(short) != len(df) or not short_lines:
+        return df
+    malformed.extend(short_lines)
+    return df[~np.array(short)].reset_index(drop=True)
+
+
+def _read_typed(file_path, engine):
+    """
+    Read a CSV with the explicit schema
+
+    Returns:
+        (DataFrame, dict of column -> mask of values that failed to parse,
+         raw text DataFrame or None if every value parsed,
+         list of lines with the wrong number of fields)
+    """
+    malformed = []
+    try:
+        return _read_csv(file_path, engine, SCHEMA, malformed), {}, None, malformed
+    except (ValueError, TypeError):
+        # A value does not match the schema: read as text and coerce column by column
+        malformed.clear()
+
+    raw_df = _read_csv(file_path, engine, 'str', malformed)
+    df = raw_df.copy()
+    unparseable = {}
+    for col in NUMERIC_COLUMNS:
+        if col not in df.columns:
+            continue
+        raw = df[col]
+        # to_numeric picks int64 for whole numbers; keep the schema's type
+        df[col] = pd.to_numeric(raw, errors='coerce').astype(SCHEMA[col])
+        unparseable[col] = raw.notna() & df[col].isna()
+    return df, unparseable, raw_df, malformed
+
+
+def _problems(df, unparseable):
+    """Build a boolean mask per problem (problem name -> rows that have it)"""
+    problems = {}
+    for col, mask in unparseable.items():
+        problems[f'unparseable {col}'] = mask
+    for col in REQUIRED_COLUMNS:
+        missing = df[col].isna()
+        if col in unparseable:
+            missing &= ~unparseable[col]
+        problems[f'missing {col}'] = missing
+    for col, (low, high) in VALID_RANGES.items():
+        values = df[col]
+        out = pd.Series(False, index=df.index)
+        if low is not None:
+            out |= values < low
+        if high is not None:
+            out |= values > high
+        problems[f'{col} out of range'] = out
+    dates = pd.to_datetime(df['date'], format='%Y-%m-%d', errors='coerce')
+    problems['invalid date'] = df['date'].notna() & dates.isna()
+    return problems
+
+
+def load_weather_csv(file_path, quarantine_dir=QUARANTINE_DIR):
+    """
+    Load and validate a weather CSV file
+
+    Rows that fail validation are written to <quarantine_dir>/<name>.quarantine.csv
+    with a 'reason' column, and left out of the returned DataFrame. Lines with the
+    wrong number of fields are kept verbatim in a 'raw_line' column.
+
+    Args:
+        file_path: Path to CSV file
+        quarantine_dir: Directory for the quarantine file
+
+    Returns:
+        (DataFrame of valid rows, ingest report dict)
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"Weather data file not found: {file_path}")
+
+    engine = csv_engine()
+    df, unparseable, raw_df, malformed = _read_typed(file_path, engine)
+
+    missing = [col for col in SCHEMA if col not in df.columns]
+    if missing:
+        raise ValueError(f"Weather data file {file_path} is missing columns: {', '.join(missing)}")
+
+    problems = _problems(df, unparseable)
+    bad = pd.Series(False, index=df.index)
+    for mask in problems.values():
+        bad |= mask
+
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    quarantine_file = os.path.join(quarantine_dir, f'{name}.quarantine.csv')
+    reasons = {reason: int(mask.sum()) for reason, mask in problems.items() if mask.any()}
+    if malformed:
+        reasons['malformed row'] = len(malformed)
+    quarantined = int(bad.sum()) + len(malformed)
+
+    if quarantined:
+        # Keep the original text of values that did not parse
+        rejected = (raw_df if raw_df is not None else df)[bad].copy()
+        rejected['reason'] = ''
+        for reason, mask in problems.items():
+            hit = mask[bad]
+            rejected.loc[hit, 'reason'] += reason + '; '
+        rejected['reason'] = rejected['reason'].str.rstrip('; ')
+        if malformed:
+            # Lines that could not be split into columns are kept verbatim
+            rejected = pd.concat([rejected, pd.DataFrame({'reason': 'malformed row',
+                                                          'raw_line': malformed})],
+                                 ignore_index=True)
+        os.makedirs(quarantine_dir, exist_ok=True)
+        rejected.to_csv(quarantine_file, index=False)
+        df = df[~bad].reset_index(drop=True)
+    elif os.path.exists(quarantine_file):
+        # Source has been fixed; drop the stale quarantine file
+        os.remove(quarantine_file)
+
+    report = {
+        'source': file_path,
+        'engine': engine,
+        'total_rows': int(len(bad)) + len(malformed),
+        'valid_rows': int(len(df)),
+        'quarantined_rows': quarantined,
+        'reasons': reasons,
+        'quarantine_file': quarantine_file if quarantined else None,
+    }
+    return df, report
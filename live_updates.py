@@ -0,0 +1,134 @@
+"""
+Live Dashboard Updates
+Watches the data file and pushes aggregate changes to all connected dashboards
+over Server-Sent Events, computing each change once for every subscriber
+"""
+import json
+import queue
+import threading
+
+
+def diff_records(old, new, key):
+    """
+    Compare two lists of records by a key field
+
+    Returns:
+        dict with 'upserts' (new or changed records) and 'removed' (keys that
+        disappeared), or None if nothing changed
+    """
+    old_by_key = {r[key]: r for r in old or []}
+    new_by_key = {r[key]: r for r in new or []}
+    upserts = [r for k, r in new_by_key.items() if old_by_key.get(k) != r]
+    removed = [k for k in old_by_key if k not in new_by_key]
+    if not upserts and not removed:
+        return None
+    return {'upserts': upserts, 'removed': removed}
+
+
+def format_event(event, data):
+    """Encode one Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class UpdateBroadcaster:
+    """Polls for data changes while anyone is subscribed and fans out deltas"""
+
+    def __init__(self, fingerprint, compute, keys, interval=2.0, buffer_size=16):
+        """
+        Args:
+            fingerprint: Callable returning an identifier of the current data version
+            compute: Callable returning {analysis name: list of records}
+            keys: {analysis name: key field used to diff its records, or None to
+                   only send {'changed': True} when the result changes}
+            interval: Seconds between checks for changed data
+            buffer_size: Messages kept per client before it is told to resync
+        """
+        self.fingerprint = fingerprint
+        self.compute = compute
+        self.keys = keys
+        self.interval = interval
+        self.buffer_size = buffer_size
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def subscribe(self):
+        """Register a client; returns the queue its messages are delivered to"""
+        client = queue.Queue(maxsize=self.buffer_size)
+        with self._lock:
+            self._subscribers.add(client)
+            self._stop.clear()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._watch, name='live-updates',
+                                                daemon=True)
+                self._thread.start()
+        return client
+
+    def unsubscribe(self, client):
+        """Remove a client; the watcher stops when the last one leaves"""
+        with self._lock:
+            self._subscribers.discard(client)
+            if not self._subscribers:
+                self._stop.set()
+
+    def subscriber_count(self):
+        """Number of connected clients"""
+        with self._lock:
+            return len(self._subscribers)
+
+    def publish(self, message):
+        """Deliver an encoded message to every client without blocking on slow ones"""
+        with self._lock:
+            clients = list(self._subscribers)
+        for client in clients:
+            try:
+                client.put_nowait(message)
+            except queue.Full:
+                # The client fell behind: drop its backlog and ask it to refetch
+                while True:
+                    try:
+                        client.get_nowait()
+                    except queue.Empty:
+                        break
+                client.put_nowait(format_event('resync', {}))
+
+    def _watch(self):
+        """Background loop: recompute on data change and publish the differences"""
+        try:
+            version = self.fingerprint()
+            results = self.compute()
+        except Exception as e:
+            print(f"✗ Live updates could not start: {e}")
+            with self._lock:
+                self._thread = None
+            return
+
+        while True:
+            if self._stop.wait(self.interval):
+                with self._lock:
+                    # A client may have subscribed again while we were waking up
+                    if not self._subscribers:
+                        self._thread = None
+                        return
+            try:
+                current = self.fingerprint()
+                if current == version:
+                    continue
+                latest = self.compute()
+            except Exception as e:
+                # Data file may be mid-write; try again on the next tick
+                print(f"⚠ Live update check failed: {e}")
+                continue
+
+            changes = {}
+            for name, key in self.keys.items():
+                if key is None:
+                    delta = {'changed': True} if results.get(name) != latest.get(name) else None
+                else:
+                    delta = diff_records(results.get(name), latest.get(name), key)
+                if delta:
+                    changes[name] = delta
+            version, results = current, latest
+            if changes:
+                self.publish(format_event('update', {'version': version, 'changes': changes}))
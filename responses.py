@@ -0,0 +1,130 @@
+"""
+API Response Encoding
+Compact binary formats for record lists and negotiated compression of API responses
+"""
+import gzip
+import importlib.util
+
+# Responses smaller than this are sent as-is; compressing them costs more than it saves
+MIN_COMPRESS_SIZE = 1024
+
+# Preferred order when the client accepts several encodings
+ENCODING_PREFERENCE = ('br', 'zstd', 'gzip')
+
+# Binary formats for ?format=..., with their media type and required package
+BINARY_FORMATS = {
+    'msgpack': ('application/msgpack', 'msgpack'),
+    'arrow': ('application/vnd.apache.arrow.stream', 'pyarrow'),
+}
+
+
+def available_encodings():
+    """Content encodings that can be produced in this environment"""
+    encodings = ['gzip']
+    if importlib.util.find_spec('brotli') is not None:
+        encodings.append('br')
+    if importlib.util.find_spec('zstandard') is not None:
+        encodings.append('zstd')
+    return encodings
+
+
+def available_formats():
+    """Response formats that can be produced in this environment"""
+    return ['json'] + [name for name, (_, package) in BINARY_FORMATS.items()
+                       if importlib.util.find_spec(package) is not None]
+
+
+def negotiate_encoding(accept_encoding):
+    """
+    Choose a content encoding from an Accept-Encoding header
+
+    Returns:
+        'br', 'zstd', 'gzip' or None for no compression
+    """
+    accepted = set()
+    refused = set()
+    for part in (accept_encoding or '').split(','):
+        token, _, params = part.strip().partition(';')
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        token = token.strip().lower()
+        if token:
+            (accepted if q > 0 else refused).add(token)
+
+    available = available_encodings()
+    for encoding in ENCODING_PREFERENCE:
+        # '*' covers only the encodings that are not refused explicitly with q=0
+        if encoding in available and encoding not in refused and (
+                encoding in accepted or '*' in accepted):
+            return encoding
+    return None
+
+
+def compress(data, encoding):
+    """Compress bytes with the given content encoding"""
+    if encoding == 'br':
+        import brotli
+        return brotli.compress(data, quality=5)
+    if encoding == 'zstd':
+        import zstandard
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+def compress_response(response, accept_encoding, min_size=MIN_COMPRESS_SIZE):
+    """
+    Compress a Flask response in place if the client accepts it and it is large enough
+
+    Streamed responses (such as Server-Sent Events) are left alone.
+    """
+    if (response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers or response.status_code < 200):
+        return response
+    response.vary.add('Accept-Encoding')
+
+    data = response.get_data()
+    if len(data) < min_size:
+        return response
+    encoding = negotiate_encoding(accept_encoding)
+    if encoding is None:
+        return response
+
+    response.set_data(compress(data, encoding))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def encode_records(records, fmt):
+    """
+    Encode a list of records column by column in a binary format
+
+    Args:
+        records: List of dictionaries with the same keys
+        fmt: 'msgpack' or 'arrow'
+
+    Returns:
+        (bytes, media type)
+    """
+    if fmt not in BINARY_FORMATS:
+        raise ValueError(f"Unknown format: {fmt}")
+    mimetype = BINARY_FORMATS[fmt][0]
+
+    if fmt == 'arrow':
+        import pyarrow as pa
+        table = pa.Table.from_pylist(records)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes(), mimetype
+
+    import msgpack
+    # Column-oriented: {column: [values...]}, so keys are not repeated per record
+    columns = list(records[0]) if records else []
+    payload = {col: [r.get(col) for r in records] for col in columns}
+    return msgpack.packb(payload, use_bin_type=True), mimetype
+
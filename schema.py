@@ -0,0 +1,29 @@
+"""
+Weather Data Schema
+Column types and validity rules shared by every processing backend
+(kept free of third-party imports so any backend can use it)
+"""
+
+# Explicit column types, so one bad value can never turn a column into object dtype
+SCHEMA = {
+    'date': 'str',
+    'location': 'str',
+    'temperature': 'float64',
+    'humidity': 'float64',
+    'precipitation': 'float64',
+    'wind_speed': 'float64',
+    'condition': 'str',
+}
+
+NUMERIC_COLUMNS = ['temperature', 'humidity', 'precipitation', 'wind_speed']
+
+# Columns a record cannot be used without
+REQUIRED_COLUMNS = ['date', 'location', 'temperature']
+
+# Valid (min, max) per column; None means unbounded
+VALID_RANGES = {
+    'temperature': (-90.0, 60.0),
+    'humidity': (0.0, 100.0),
+    'precipitation': (0.0, None),
+    'wind_speed': (0.0, None),
+}
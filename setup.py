@@ -1,7 +1,7 @@
 """
 Setup script to generate initial weather data
 """
-from data_generator import generate_weather_data
+from data_generator import generate_weather_data, generate_station_metadata
 import os
 
 if __name__ == '__main__':
@@ -21,6 +21,10 @@ if __name__ == '__main__':
         generate_weather_data(1000, data_file)
         print("Data generation complete!")
     
+    stations_file = 'data/stations.csv'
+    if not os.path.exists(stations_file):
+        generate_station_metadata(stations_file)
+    
     print("\nSetup complete!")
     print("To run the application, execute: python app.py")
     print("Then open your browser to: http://localhost:5000")
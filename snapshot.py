@@ -0,0 +1,216 @@
+"""
+Snapshot Store
+Persists computed aggregates and loaded columnar data next to the source file,
+so a restarted server can answer from disk instead of re-parsing the CSV
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+
+# Bump when the on-disk layout or the meaning of stored aggregates changes
+SNAPSHOT_VERSION = 3
+
+SNAPSHOT_DIR = 'data/snapshots'
+
+
+def fingerprint(file_path):
+    """Identify a version of a source file by path, size and modification time"""
+    stat = os.stat(file_path)
+    key = f"{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}|{SNAPSHOT_VERSION}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def _to_builtin(value):
+    """json.dump fallback for numpy scalars"""
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _write_json(path, data):
+    """Write JSON atomically so readers never see a partial file"""
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, default=_to_builtin)
+    os.replace(tmp, path)
+
+
+def _read_json(path):
+    """Read a JSON file, or return None if it is missing or unreadable"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class SnapshotStore:
+    """Aggregate results and columnar data for one source file, versioned by fingerprint"""
+
+    def __init__(self, source, snapshot_dir=SNAPSHOT_DIR):
+        """
+        Args:
+            source: Path to the source data file
+            snapshot_dir: Directory that holds one sub-directory per source file
+        """
+        self.source = source
+        name = os.path.splitext(os.path.basename(source))[0]
+        self.path = os.path.join(snapshot_dir, name)
+        self._lock = threading.Lock()
+        self._aggregates = None
+        self._aggregates_fingerprint = None
+
+    def current_fingerprint(self):
+        """Fingerprint of the source file as it is on disk now"""
+        return fingerprint(self.source)
+
+    def _frame_dir(self, current):
+        """Directory holding the columns of one version of the source"""
+        return os.path.join(self.path, current)
+
+    def _remove_stale(self, current):
+        """
+        Delete snapshot files that belong to an older version of the source
+
+        Old column directories are removed on a best-effort basis: on Windows a file
+        that is still memory-mapped cannot be deleted, so it is retried next time.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        aggregates = _read_json(os.path.join(self.path, 'aggregates.json'))
+        if aggregates and aggregates.get('fingerprint') != current:
+            os.remove(os.path.join(self.path, 'aggregates.json'))
+        for name in os.listdir(self.path):
+            target = os.path.join(self.path, name)
+            if os.path.isdir(target) and name != current:
+                shutil.rmtree(target, ignore_errors=True)
+            elif name.endswith('.npy') or name == 'manifest.json':
+                # Columns stored by SNAPSHOT_VERSION 1, directly in self.path
+                try:
+                    os.remove(target)
+                except OSError:
+                    pass
+
+    # Aggregates
+
+    def _load_aggregates(self, current):
+        """Load aggregates.json into memory if it matches the current source"""
+        if self._aggregates_fingerprint == current:
+            return
+        stored = _read_json(os.path.join(self.path, 'aggregates.json')) or {}
+        if stored.get('fingerprint') == current:
+            self._aggregates = stored.get('results', {})
+        else:
+            self._aggregates = {}
+        self._aggregates_fingerprint = current
+
+    def get_aggregate(self, name):
+        """Return a stored aggregate result, or None if missing or stale"""
+        if not os.path.exists(self.source):
+            return None
+        with self._lock:
+            self._load_aggregates(self.current_fingerprint())
+            return self._aggregates.get(name)
+
+    def put_aggregate(self, name, result, fingerprint):
+        """
+        Store an aggregate result for the version of the source it was computed from
+
+        Args:
+            name: Analysis name
+            result: JSON-serializable result
+            fingerprint: Fingerprint of the source taken before it was read
+
+        Returns:
+            False if the source has changed since then and nothing was stored
+        """
+        with self._lock:
+            current = self.current_fingerprint()
+            if current != fingerprint:
+                return False
+            self._load_aggregates(current)
+            self._remove_stale(current)
+            self._aggregates[name] = result
+            _write_json(os.path.join(self.path, 'aggregates.json'),
+                        {'fingerprint': current, 'results': self._aggregates})
+            return True
+
+    # Columnar data
+
+    def load_frame(self):
+        """
+        Memory-map the stored columns back into a DataFrame
+
+        Returns:
+            (DataFrame, metadata dict) or (None, None) if missing or stale
+        """
+        # Imported here so serving stored aggregates never loads numpy/pandas
+        import numpy as np
+        import pandas as pd
+
+        if not os.path.exists(self.source):
+            return None, None
+        frame_dir = self._frame_dir(self.current_fingerprint())
+        manifest = _read_json(os.path.join(frame_dir, 'manifest.json'))
+        if not manifest:
+            return None, None
+
+        columns = {}
+        try:
+            for col, spec in manifest['columns'].items():
+                values = np.load(os.path.join(frame_dir, f'{col}.npy'), mmap_mode='r')
+                if spec['kind'] == 'text':
+                    # Text is stored as codes into its distinct values (-1 for missing);
+                    # the categorical keeps using the mapped codes
+                    values = pd.Categorical.from_codes(values, categories=spec['categories'])
+                columns[col] = values
+        except (OSError, ValueError, KeyError):
+            return None, None
+        return pd.DataFrame(columns, copy=False), manifest.get('metadata')
+
+    def save_frame(self, df, fingerprint, metadata=None):
+        """
+        Store a DataFrame as one .npy file per column, in a directory of its own
+        for this version of the source (files of a version are never replaced, so
+        a frame that is still memory-mapped stays valid)
+
+        Args:
+            df: DataFrame to store
+            fingerprint: Fingerprint of the source taken before it was read
+            metadata: JSON-serializable dict returned again by load_frame
+
+        Returns:
+            False if the source has changed since then and nothing was stored
+        """
+        import numpy as np
+        import pandas as pd
+
+        with self._lock:
+            current = self.current_fingerprint()
+            if current != fingerprint:
+                return False
+            self._remove_stale(current)
+            frame_dir = self._frame_dir(current)
+            if _read_json(os.path.join(frame_dir, 'manifest.json')):
+                # Already stored by another worker
+                return True
+            os.makedirs(frame_dir, exist_ok=True)
+            spec = {}
+            for col in df.columns:
+                series = df[col]
+                if pd.api.types.is_numeric_dtype(series):
+                    values = series.to_numpy(dtype='float64')
+                    spec[col] = {'kind': 'numeric'}
+                else:
+                    # Saved with the code dtype pandas picks, so loading does not convert them
+                    categorical = series.astype('category')
+                    values = categorical.cat.codes.to_numpy()
+                    spec[col] = {'kind': 'text',
+                                 'categories': [str(c) for c in categorical.cat.categories]}
+                np.save(os.path.join(frame_dir, f'{col}.npy'), values)
+            # Written last: a directory without a manifest is never loaded
+            _write_json(os.path.join(frame_dir, 'manifest.json'),
+                        {'fingerprint': current, 'rows': int(len(df)),
+                         'columns': spec, 'metadata': metadata})
+            return True
@@ -5,10 +5,12 @@ Uses MapReduce/RDD concepts for distributed processing
 from pyspark.sql import SparkSession
 from pyspark import SparkContext
 from pyspark.sql.types import StructType, StructField, StringType, DoubleType, DateType
-from pyspark.sql.functions import col, avg, max as spark_max, min as spark_min, count
+from pyspark.sql.functions import col, to_date, avg, max as spark_max, min as spark_min, sum as spark_sum, count
 from datetime import datetime
 import os
 
+from schema import REQUIRED_COLUMNS, VALID_RANGES
+
 class WeatherDataProcessor:
     """Process weather data using Spark RDD operations"""
     
@@ -46,13 +48,19 @@ class WeatherDataProcessor:
         ])
         
         # Load as DataFrame first, then convert to RDD for MapReduce operations
-        df = self.spark.read.csv(file_path, header=True, schema=schema)
+        # DROPMALFORMED drops rows with unparseable numbers instead of nulling the value
+        df = self.spark.read.csv(file_path, header=True, schema=schema, mode='DROPMALFORMED')
         
-        # Filter out any completely null rows
-        df = df.filter(
-            df.location.isNotNull() & 
-            df.temperature.isNotNull()
-        )
+        # Same validity rules as the pandas ingest stage; failing rows are dropped, not quarantined
+        for column in REQUIRED_COLUMNS:
+            df = df.filter(col(column).isNotNull())
+        df = df.filter(to_date(col('date'), 'yyyy-MM-dd').isNotNull())
+        
+        for column, (low, high) in VALID_RANGES.items():
+            if low is not None:
+                df = df.filter(col(column).isNull() | (col(column) >= low))
+            if high is not None:
+                df = df.filter(col(column).isNull() | (col(column) <= high))
         
         return df
     
@@ -276,6 +284,18 @@ class WeatherDataProcessor:
         
         return avg_humidity if avg_humidity else []
     
+    def get_location_partials(self, df):
+        """Get unrounded per-location sums, counts and extremes that can be merged across stations"""
+        aggregations = [count("*").alias("record_count")]
+        for column in ("temperature", "humidity", "precipitation", "wind_speed"):
+            aggregations.append(spark_sum(column).alias(f"{column}_sum"))
+            aggregations.append(count(column).alias(f"{column}_count"))
+        aggregations.append(spark_min("temperature").alias("temperature_min"))
+        aggregations.append(spark_max("temperature").alias("temperature_max"))
+        
+        rows = df.groupBy("location").agg(*aggregations).collect()
+        return [row.asDict() for row in rows]
+    
     def close(self):
         """Close Spark session"""
         self.spark.stop()
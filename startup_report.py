@@ -0,0 +1,120 @@
+"""
+Startup Cost Report
+Measures import time, initialization time and memory per module, each in a fresh interpreter
+
+Usage:
+    python app.py --startup-report
+    python startup_report.py
+"""
+import json
+import os
+import subprocess
+import sys
+
+import backends
+
+# Modules the web process and CLI scripts import directly
+APP_MODULES = ['app', 'backends', 'snapshot', 'data_generator', 'flask']
+
+# Optional packages that should only be loaded once a backend needs them
+HEAVY_MODULES = ['pandas', 'numpy', 'pyarrow', 'duckdb', 'pyspark']
+
+# Runs in a child interpreter so every measurement starts from a cold import cache
+_CHILD = r"""
+import importlib, json, os, sys, time
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+def memory_mb():
+    try:
+        # Current resident size; ru_maxrss on Linux can include the parent's peak
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return round(pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024), 1)
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+module, backend = sys.argv[1], sys.argv[2]
+before = set(sys.modules)
+memory_before = memory_mb()
+
+start = time.perf_counter()
+importlib.import_module(module)
+import_ms = (time.perf_counter() - start) * 1000
+
+init_ms = None
+if backend:
+    import backends
+    start = time.perf_counter()
+    backends.create_processor(backend).close()
+    init_ms = (time.perf_counter() - start) * 1000
+
+memory_after = memory_mb()
+print(json.dumps({
+    'import_ms': round(import_ms, 1),
+    'init_ms': round(init_ms, 1) if init_ms is not None else None,
+    'memory_mb': round(memory_after - memory_before, 1) if memory_after is not None else None,
+    'modules_loaded': len(set(sys.modules) - before),
+    'heavy_loaded': [m for m in %r if m in sys.modules],
+}))
+""" % (HEAVY_MODULES,)
+
+
+def measure(module, backend=''):
+    """
+    Import a module (and optionally create a backend processor) in a fresh interpreter
+
+    Args:
+        module: Module to import
+        backend: Backend name to initialize after the import, or '' for none
+
+    Returns:
+        dict with import_ms, init_ms, memory_mb, modules_loaded and heavy_loaded,
+        or {'error': message} if the child failed
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    proc = subprocess.run([sys.executable, '-c', _CHILD, module, backend],
+                          cwd=here, capture_output=True, text=True)
+    if proc.returncode != 0:
+        lines = proc.stderr.strip().splitlines()
+        return {'error': lines[-1] if lines else f'exit code {proc.returncode}'}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def collect():
+    """Measure the web process modules and every installed backend"""
+    rows = []
+    for module in APP_MODULES:
+        rows.append((module, measure(module)))
+    for name in backends.available_backends():
+        module = backends.backend_module(name)
+        rows.append((f'{module} ({name} backend)', measure(module, name)))
+    return rows
+
+
+def print_report(rows):
+    """Print the measurements as a table"""
+    print("\n" + "="*78)
+    print("Startup cost per module (fresh interpreter each)")
+    print("="*78)
+    print(f"{'Module':<38}{'Import ms':>10}{'Init ms':>10}{'Mem MB':>8}  Heavy deps loaded")
+    for name, result in rows:
+        if 'error' in result:
+            print(f"{name:<38}  ✗ {result['error']}")
+            continue
+        init_ms = result['init_ms'] if result['init_ms'] is not None else '-'
+        memory = result['memory_mb'] if result['memory_mb'] is not None else '-'
+        heavy = ', '.join(result['heavy_loaded']) or '-'
+        print(f"{name:<38}{result['import_ms']:>10}{init_ms:>10}{memory:>8}  {heavy}")
+    print("="*78 + "\n")
+
+
+if __name__ == '__main__':
+    print_report(collect())
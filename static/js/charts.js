@@ -10,6 +10,11 @@ const chartColors = {
     secondary: 'rgba(201, 203, 207, 0.8)'
 };
 
+// Dashboard charts and the data behind them, kept for live updates
+const dashboardCharts = {};
+const dashboardData = {};
+let dashboardUpdates = null;
+
 // Dashboard data loading
 async function loadDashboardData() {
     console.log('Starting to load dashboard data...');
@@ -43,34 +48,14 @@ async function loadDashboardData() {
     try {
         // Load temperature data
         console.log('Loading temperature data...');
-        let tempResponse;
         let tempData;
         try {
             // Add timeout to prevent hanging
             const controller = new AbortController();
             const timeoutId = setTimeout(() => controller.abort(), 30000); // 30 second timeout
             
-            tempResponse = await fetch('/api/temperature-by-location', {
-                method: 'GET',
-                headers: {
-                    'Accept': 'application/json',
-                },
-                cache: 'no-cache',
-                signal: controller.signal
-            });
-            
+            tempData = await fetchRecords('/api/temperature-by-location', { signal: controller.signal });
             clearTimeout(timeoutId);
-            
-            if (!tempResponse.ok) {
-                try {
-                    tempData = await tempResponse.json();
-                    const errorMsg = tempData.error || `Temperature API error: ${tempResponse.status}`;
-                    throw new Error(errorMsg);
-                } catch (jsonError) {
-                    throw new Error(`Server error: ${tempResponse.status} ${tempResponse.statusText}`);
-                }
-            }
-            tempData = await tempResponse.json();
             console.log('✓ Temperature data loaded:', tempData.length, 'locations');
         } catch (fetchError) {
             console.error('✗ Error fetching temperature data:', fetchError);
@@ -92,26 +77,9 @@ async function loadDashboardData() {
 
         // Load condition data
         console.log('Loading condition data...');
-        let conditionResponse;
         let conditionData;
         try {
-            conditionResponse = await fetch('/api/weather-conditions', {
-                method: 'GET',
-                headers: {
-                    'Accept': 'application/json',
-                },
-                cache: 'no-cache'
-            });
-            if (!conditionResponse.ok) {
-                try {
-                    conditionData = await conditionResponse.json();
-                    const errorMsg = conditionData.error || `Conditions API error: ${conditionResponse.status}`;
-                    throw new Error(errorMsg);
-                } catch (jsonError) {
-                    throw new Error(`Server error: ${conditionResponse.status} ${conditionResponse.statusText}`);
-                }
-            }
-            conditionData = await conditionResponse.json();
+            conditionData = await fetchRecords('/api/weather-conditions');
             console.log('✓ Condition data loaded:', conditionData.length, 'conditions');
         } catch (fetchError) {
             console.error('✗ Error fetching condition data:', fetchError);
@@ -130,26 +98,9 @@ async function loadDashboardData() {
 
         // Load daily temperature
         console.log('Loading daily temperature data...');
-        let dailyTempResponse;
         let dailyTempData;
         try {
-            dailyTempResponse = await fetch('/api/daily-temperature', {
-                method: 'GET',
-                headers: {
-                    'Accept': 'application/json',
-                },
-                cache: 'no-cache'
-            });
-            if (!dailyTempResponse.ok) {
-                try {
-                    dailyTempData = await dailyTempResponse.json();
-                    const errorMsg = dailyTempData.error || `Daily temp API error: ${dailyTempResponse.status}`;
-                    throw new Error(errorMsg);
-                } catch (jsonError) {
-                    throw new Error(`Server error: ${dailyTempResponse.status} ${dailyTempResponse.statusText}`);
-                }
-            }
-            dailyTempData = await dailyTempResponse.json();
+            dailyTempData = await fetchRecords('/api/daily-temperature');
             console.log('✓ Daily temperature data loaded:', dailyTempData.length, 'days');
         } catch (fetchError) {
             console.error('✗ Error fetching daily temperature data:', fetchError);
@@ -170,6 +121,11 @@ async function loadDashboardData() {
         if (tempData && !tempData.error && conditionData && !conditionData.error) {
             updateQuickStats(tempData, conditionData);
         }
+
+        // Keep the charts current without reloading the page
+        dashboardData.temperature = tempData;
+        dashboardData.conditions = conditionData;
+        subscribeToDashboardUpdates();
     } catch (error) {
         console.error('Error loading dashboard data:', error);
         showError('tempChart', error.message);
@@ -220,7 +176,7 @@ function createTempChart(data) {
     const locations = data.map(d => d.location);
     const temps = data.map(d => d.avg_temperature);
 
-    new Chart(ctx, {
+    dashboardCharts.temp = new Chart(ctx, {
         type: 'bar',
         data: {
             labels: locations,
@@ -266,7 +222,7 @@ function createConditionChart(data) {
     const conditions = data.map(d => d.condition);
     const counts = data.map(d => d.count);
 
-    new Chart(ctx, {
+    dashboardCharts.condition = new Chart(ctx, {
         type: 'doughnut',
         data: {
             labels: conditions,
@@ -307,7 +263,7 @@ function createDailyTempChart(data) {
     const dates = data.map(d => d.date);
     const temps = data.map(d => d.avg_temperature);
 
-    new Chart(ctx, {
+    dashboardCharts.dailyTemp = new Chart(ctx, {
         type: 'line',
         data: {
             labels: dates,
@@ -342,6 +298,119 @@ function createDailyTempChart(data) {
     });
 }
 
+// Live updates (Server-Sent Events from /api/stream)
+function subscribeToDashboardUpdates() {
+    if (dashboardUpdates || !window.EventSource) return;
+
+    dashboardUpdates = new EventSource('/api/stream');
+    dashboardUpdates.addEventListener('update', (event) => {
+        const changes = JSON.parse(event.data).changes;
+        console.log('Live update received:', Object.keys(changes));
+        if (changes.get_temperature_stats_by_location) {
+            dashboardData.temperature = mergeRecords(dashboardData.temperature,
+                changes.get_temperature_stats_by_location, 'location');
+        }
+        if (changes.get_weather_condition_distribution) {
+            dashboardData.conditions = mergeRecords(dashboardData.conditions,
+                changes.get_weather_condition_distribution, 'condition');
+        }
+        renderDashboardUpdate();
+        if (changes.get_daily_average_temperature) {
+            // The server downsamples the series, so fetch the new selection of points
+            refreshDailyTempChart();
+        }
+    });
+    // Sent when this page fell too far behind; reload everything from the API
+    dashboardUpdates.addEventListener('resync', () => resyncDashboard());
+}
+
+// Apply {upserts, removed} to a list of records
+function mergeRecords(records, delta, key) {
+    const byKey = new Map((records || []).map(r => [r[key], r]));
+    delta.removed.forEach(k => byKey.delete(k));
+    delta.upserts.forEach(r => byKey.set(r[key], r));
+    return Array.from(byKey.values());
+}
+
+function updateChartData(chart, labels, values) {
+    if (!chart) return;
+    chart.data.labels = labels;
+    chart.data.datasets[0].data = values;
+    chart.update('none');
+}
+
+function renderDashboardUpdate() {
+    const temps = dashboardData.temperature || [];
+    const conditions = dashboardData.conditions || [];
+    updateChartData(dashboardCharts.temp, temps.map(d => d.location), temps.map(d => d.avg_temperature));
+    updateChartData(dashboardCharts.condition, conditions.map(d => d.condition), conditions.map(d => d.count));
+    updateQuickStats(temps, conditions);
+}
+
+async function refreshDailyTempChart() {
+    try {
+        const data = await fetchRecords('/api/daily-temperature');
+        updateChartData(dashboardCharts.dailyTemp, data.map(d => d.date), data.map(d => d.avg_temperature));
+    } catch (error) {
+        console.error('Error refreshing daily temperature:', error);
+    }
+}
+
+async function resyncDashboard() {
+    try {
+        [dashboardData.temperature, dashboardData.conditions] = await Promise.all([
+            fetchRecords('/api/temperature-by-location'),
+            fetchRecords('/api/weather-conditions')
+        ]);
+        renderDashboardUpdate();
+        refreshDailyTempChart();
+    } catch (error) {
+        console.error('Error resyncing dashboard:', error);
+    }
+}
+
+// Fetch a list of records, as compact MessagePack (?format=msgpack) when the
+// decoder is loaded on the page (see index.html), otherwise as JSON
+async function fetchRecords(url, options = {}) {
+    let binary = typeof MessagePack !== 'undefined';
+    const separator = url.includes('?') ? '&' : '?';
+    let response = await fetch(binary ? `${url}${separator}format=msgpack` : url,
+                               { cache: 'no-cache', ...options });
+    if (binary && response.status === 406) {
+        // The server cannot produce MessagePack (msgpack not installed)
+        binary = false;
+        response = await fetch(url, { cache: 'no-cache', ...options });
+    }
+    if (!response.ok) {
+        // Errors are always sent as JSON
+        let errorMsg = `Server error: ${response.status} ${response.statusText}`;
+        try {
+            const body = await response.json();
+            if (body.error) errorMsg = body.error;
+        } catch (jsonError) {
+            // Not JSON; keep the status text
+        }
+        throw new Error(errorMsg);
+    }
+    if (!binary) {
+        return response.json();
+    }
+    return columnsToRecords(MessagePack.decode(new Uint8Array(await response.arrayBuffer())));
+}
+
+// Turn {column: [values...]} back into a list of records
+function columnsToRecords(columns) {
+    const names = Object.keys(columns);
+    const length = names.length ? columns[names[0]].length : 0;
+    const records = new Array(length);
+    for (let i = 0; i < length; i++) {
+        const record = {};
+        names.forEach(name => { record[name] = columns[name][i]; });
+        records[i] = record;
+    }
+    return records;
+}
+
 // Update quick stats
 function updateQuickStats(tempData, conditionData) {
     try {
@@ -0,0 +1,189 @@
+"""
+Station Index
+Integer station index with a lat/lon grid, and roll-ups of precomputed per-station
+aggregates by region, bounding box, grid cell or nearest stations
+"""
+import csv
+import itertools
+import os
+import numpy as np
+
+# Size of a spatial grid cell in degrees
+GRID_CELL_DEG = 1.0
+
+EARTH_RADIUS_KM = 6371.0
+
+# Metrics that have <metric>_sum and <metric>_count in the per-station partials
+PARTIAL_METRICS = ('temperature', 'humidity', 'precipitation', 'wind_speed')
+
+
+def _cell(lat, lon, cell_deg):
+    """Grid cell (row, column) of coordinates"""
+    return np.floor(np.asarray(lat) / cell_deg).astype(np.int64), \
+        np.floor(np.asarray(lon) / cell_deg).astype(np.int64)
+
+
+class StationIndex:
+    """Station metadata in arrays addressed by an integer station index (0..n-1)"""
+
+    def __init__(self, station_ids, names, lat, lon, regions, cell_deg=GRID_CELL_DEG):
+        """
+        Args:
+            station_ids: Station ids from the metadata file
+            names: Station names, matching the 'location' column of the weather data
+            lat, lon: Coordinates in degrees
+            regions: Region name per station
+            cell_deg: Grid cell size used by the spatial index
+        """
+        self.station_ids = np.asarray(station_ids, dtype=np.int64)
+        self.names = list(names)
+        self.lat = np.asarray(lat, dtype='float64')
+        self.lon = np.asarray(lon, dtype='float64')
+        self.regions = np.asarray(regions, dtype=object)
+        self.cell_deg = cell_deg
+        self.by_name = {name: i for i, name in enumerate(self.names)}
+
+        # Spatial index: grid cell -> station indices in that cell
+        rows, cols = _cell(self.lat, self.lon, cell_deg)
+        self.cells = {}
+        for i, key in enumerate(zip(rows.tolist(), cols.tolist())):
+            self.cells.setdefault(key, []).append(i)
+        self.cells = {key: np.array(members) for key, members in self.cells.items()}
+
+        self.by_region = {region: np.flatnonzero(self.regions == region)
+                          for region in sorted(set(self.regions.tolist()))}
+
+    @classmethod
+    def from_csv(cls, file_path, cell_deg=GRID_CELL_DEG):
+        """Load station metadata (station_id, name, lat, lon, region) from a CSV file"""
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"Station metadata file not found: {file_path}")
+        with open(file_path, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        return cls([int(r['station_id']) for r in rows], [r['name'] for r in rows],
+                   [float(r['lat']) for r in rows], [float(r['lon']) for r in rows],
+                   [r['region'] for r in rows], cell_deg)
+
+    def __len__(self):
+        return len(self.names)
+
+    def describe(self, indices):
+        """Metadata records for station indices"""
+        return [{'station_id': int(self.station_ids[i]), 'name': self.names[i],
+                 'lat': float(self.lat[i]), 'lon': float(self.lon[i]),
+                 'region': self.regions[i]} for i in indices]
+
+    def in_region(self, region):
+        """Indices of the stations in a region"""
+        if region not in self.by_region:
+            raise ValueError(f"Unknown region: {region} (choose from {', '.join(self.by_region)})")
+        return self.by_region[region]
+
+    def in_bbox(self, min_lat, min_lon, max_lat, max_lon):
+        """Indices of the stations inside a bounding box, using the grid to skip far cells"""
+        if min_lat > max_lat or min_lon > max_lon:
+            raise ValueError("Bounding box minimum must not exceed maximum")
+        (row_lo, row_hi), (col_lo, col_hi) = [
+            tuple(v.tolist()) for v in _cell([min_lat, max_lat], [min_lon, max_lon], self.cell_deg)]
+        if (row_hi - row_lo + 1) * (col_hi - col_lo + 1) < len(self.cells):
+            # Small box: look up just the cells it covers
+            candidates = [self.cells[key] for key in
+                          itertools.product(range(row_lo, row_hi + 1), range(col_lo, col_hi + 1))
+                          if key in self.cells]
+        else:
+            candidates = [members for (row, col), members in self.cells.items()
+                          if row_lo <= row <= row_hi and col_lo <= col <= col_hi]
+        if not candidates:
+            return np.array([], dtype=np.int64)
+        idx = np.concatenate(candidates)
+        inside = ((self.lat[idx] >= min_lat) & (self.lat[idx] <= max_lat)
+                  & (self.lon[idx] >= min_lon) & (self.lon[idx] <= max_lon))
+        return np.sort(idx[inside])
+
+    def distances_km(self, lat, lon):
+        """Great-circle distance from a point to every station"""
+        lat1, lon1 = np.radians(lat), np.radians(lon)
+        lat2, lon2 = np.radians(self.lat), np.radians(self.lon)
+        a = (np.sin((lat2 - lat1) / 2) ** 2
+             + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+    def nearest(self, lat, lon, n):
+        """
+        The n stations closest to a point
+
+        Returns:
+            (station indices, distances in km), closest first
+        """
+        dist = self.distances_km(lat, lon)
+        n = min(n, len(dist))
+        if n <= 0:
+            return np.array([], dtype=np.int64), np.array([])
+        idx = np.argpartition(dist, n - 1)[:n]
+        idx = idx[np.argsort(dist[idx])]
+        return idx, dist[idx]
+
+    def grid_cells(self, cell_deg):
+        """Group stations into cells of any size: {(row, col): station indices}"""
+        rows, cols = _cell(self.lat, self.lon, cell_deg)
+        keys, inverse, counts = np.unique(np.stack([rows, cols], axis=1), axis=0,
+                                          return_inverse=True, return_counts=True)
+        groups = np.split(np.argsort(inverse.reshape(-1), kind='stable'), np.cumsum(counts)[:-1])
+        return {tuple(key.tolist()): members for key, members in zip(keys, groups)}
+
+
+class StationAggregates:
+    """Per-station partial aggregates aligned with a StationIndex, merged on demand"""
+
+    def __init__(self, index, partials):
+        """
+        Args:
+            index: StationIndex
+            partials: Records from a processor's get_location_partials
+        """
+        self.index = index
+        n = len(index)
+        self.record_count = np.zeros(n)
+        self.sums = {m: np.zeros(n) for m in PARTIAL_METRICS}
+        self.counts = {m: np.zeros(n) for m in PARTIAL_METRICS}
+        self.temperature_min = np.full(n, np.inf)
+        self.temperature_max = np.full(n, -np.inf)
+        self.unmatched_locations = []
+
+        for record in partials:
+            i = index.by_name.get(record['location'])
+            if i is None:
+                self.unmatched_locations.append(record['location'])
+                continue
+            self.record_count[i] = record['record_count']
+            for m in PARTIAL_METRICS:
+                self.sums[m][i] = record[f'{m}_sum'] or 0.0
+                self.counts[m][i] = record[f'{m}_count'] or 0
+            if record['temperature_min'] is not None:
+                self.temperature_min[i] = record['temperature_min']
+                self.temperature_max[i] = record['temperature_max']
+
+    def combine(self, indices):
+        """
+        Merge the aggregates of a set of stations
+
+        Returns:
+            dict with station and record counts and the combined statistics
+        """
+        idx = np.asarray(indices, dtype=np.int64)
+
+        def average(metric):
+            total = self.counts[metric][idx].sum()
+            return round(float(self.sums[metric][idx].sum() / total), 2) if total else None
+
+        has_temperature = idx.size and self.counts['temperature'][idx].sum() > 0
+        return {
+            'station_count': int(idx.size),
+            'record_count': int(self.record_count[idx].sum()),
+            'avg_temperature': average('temperature'),
+            'max_temperature': round(float(self.temperature_max[idx].max()), 2) if has_temperature else None,
+            'min_temperature': round(float(self.temperature_min[idx].min()), 2) if has_temperature else None,
+            'avg_humidity': average('humidity'),
+            'total_precipitation': round(float(self.sums['precipitation'][idx].sum()), 2),
+            'avg_wind_speed': average('wind_speed'),
+        }